@@ -1,17 +1,506 @@
-from flask import Flask, send_from_directory, jsonify, request, render_template
+from flask import Flask, send_from_directory, jsonify, request, render_template, Response, stream_with_context, url_for, g, has_app_context
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
+from concurrent.futures import Future
+from contextlib import contextmanager
+from collections import OrderedDict
+from functools import wraps
 import sqlite3
+import threading
+import queue
 import json
+import csv
+import io
+import os
+import re
+import base64
+import time
+import random
+import cProfile
+import hmac
+import click
 
 app = Flask(__name__, static_folder='static')  # Ensure Flask knows where the static folder is
+app.config['DATABASE'] = os.environ.get('EMPLOYEES_DB', 'employees.db')
+app.config['DB_BUSY_TIMEOUT'] = float(os.environ.get('EMPLOYEES_DB_BUSY_TIMEOUT', 5.0))  # seconds
+app.config['GROUP_COMMIT'] = os.environ.get('EMPLOYEES_GROUP_COMMIT', '0') == '1'
+app.config['GROUP_COMMIT_WINDOW'] = float(os.environ.get('EMPLOYEES_GROUP_COMMIT_WINDOW', 0.002))  # seconds
+app.config['GROUP_COMMIT_MAX_BATCH'] = int(os.environ.get('EMPLOYEES_GROUP_COMMIT_MAX_BATCH', 256))
+app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('EMPLOYEES_RESPONSE_CACHE_SIZE', 1024))  # entries
+app.config['RESPONSE_CACHE_TTL'] = float(os.environ.get('EMPLOYEES_RESPONSE_CACHE_TTL', 5.0))  # seconds
+app.config['SLOW_REQUEST_THRESHOLD'] = float(os.environ.get('EMPLOYEES_SLOW_REQUEST_THRESHOLD', 0.5))  # seconds
+app.config['SLOW_QUERY_THRESHOLD'] = float(os.environ.get('EMPLOYEES_SLOW_QUERY_THRESHOLD', 0.1))  # seconds
+app.config['PROFILE_DIR'] = os.environ.get('EMPLOYEES_PROFILE_DIR')  # profiling is off unless set
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('EMPLOYEES_PROFILE_SAMPLE_RATE', 0.0))
+app.config['PROFILE_TOKEN'] = os.environ.get('EMPLOYEES_PROFILE_TOKEN')  # X-Profile is ignored unless set
+app.config['PROFILE_MAX_FILES'] = int(os.environ.get('EMPLOYEES_PROFILE_MAX_FILES', 100))  # oldest are deleted
 CORS(app)
 
 # Database connection
-def get_db_connection():
-    conn = sqlite3.connect('employees.db')
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',       # readers no longer block on the writer
+    'PRAGMA synchronous = NORMAL',     # fsync on checkpoint instead of every commit; safe with WAL
+    'PRAGMA cache_size = -16000',      # ~16 MB page cache per connection
+    'PRAGMA mmap_size = 268435456',    # 256 MB memory-mapped reads
+    'PRAGMA temp_store = MEMORY',
+)
+STATEMENT_CACHE_SIZE = 256
+
+# Connections are kept per worker thread and reused across requests
+_thread_connections = threading.local()
+_initialized_databases = set()
+_fts_databases = set()  # databases whose SQLite build has FTS5
+_init_lock = threading.Lock()
+
+def open_db_connection(database):
+    conn = sqlite3.connect(database, timeout=app.config['DB_BUSY_TIMEOUT'], cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def ensure_db_initialized(database):
+    # Create the schema and run pending migrations once per process
+    with _init_lock:
+        if database not in _initialized_databases:
+            init_db(database)
+            _initialized_databases.add(database)
+
+def get_db_connection():
+    if 'db' not in g:
+        database = app.config['DATABASE']
+        ensure_db_initialized(database)
+        connections = getattr(_thread_connections, 'connections', None)
+        if connections is None:
+            connections = _thread_connections.connections = {}
+        if database not in connections:
+            connections[database] = open_db_connection(database)
+        g.db = InstrumentedConnection(connections[database])
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(error):
+    conn = g.pop('db', None)
+    # Never hand a half-finished transaction to the next request on this thread
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+
+@contextmanager
+def write_transaction():
+    # BEGIN IMMEDIATE takes the write lock up front so concurrent writers wait
+    # on the busy timeout instead of failing on a read-to-write lock upgrade
+    conn = get_db_connection()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+# Instrumentation
+# Per-process request and SQL metrics, exposed in Prometheus text format at /metrics.
+# With several gunicorn workers each process reports its own series.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}        # (method, route, status) -> count
+        self.latency = {}         # (method, route) -> bucket counts, then sum and count
+        self.response_bytes = {}  # (method, route) -> [sum, count]
+        self.statements = {}      # (method, route) -> [statement count, seconds]
+        self.counters = {'slow_requests': 0, 'slow_queries': 0, 'internal_errors': 0, 'profiles': 0}
+
+    def observe_request(self, method, route, status, seconds, size, statement_count, statement_seconds):
+        key = (method, route)
+        with self._lock:
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            latency = self.latency.setdefault(key, [0] * len(LATENCY_BUCKETS) + [0.0, 0])
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    latency[index] += 1
+            latency[-2] += seconds
+            latency[-1] += 1
+            if size is not None:
+                response_bytes = self.response_bytes.setdefault(key, [0, 0])
+                response_bytes[0] += size
+                response_bytes[1] += 1
+            statements = self.statements.setdefault(key, [0, 0.0])
+            statements[0] += statement_count
+            statements[1] += statement_seconds
+
+    def increment(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def render(self):
+        lines = []
+
+        def family(name, metric_type, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+        with self._lock:
+            family('employees_http_requests_total', 'counter', 'HTTP requests by route and status.')
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'employees_http_requests_total{{{labels(method=method, route=route, status=status)}}} {count}')
+
+            family('employees_http_request_duration_seconds', 'histogram', 'Time spent handling requests.')
+            for (method, route), latency in sorted(self.latency.items()):
+                for bound, count in zip(LATENCY_BUCKETS, latency):
+                    lines.append(f'employees_http_request_duration_seconds_bucket{{{labels(method=method, route=route, le=bound)}}} {count}')
+                lines.append(f'employees_http_request_duration_seconds_bucket{{{labels(method=method, route=route, le="+Inf")}}} {latency[-1]}')
+                lines.append(f'employees_http_request_duration_seconds_sum{{{labels(method=method, route=route)}}} {latency[-2]}')
+                lines.append(f'employees_http_request_duration_seconds_count{{{labels(method=method, route=route)}}} {latency[-1]}')
+
+            family('employees_http_response_size_bytes', 'summary', 'Response body sizes (streamed responses excluded).')
+            for (method, route), (total, count) in sorted(self.response_bytes.items()):
+                lines.append(f'employees_http_response_size_bytes_sum{{{labels(method=method, route=route)}}} {total}')
+                lines.append(f'employees_http_response_size_bytes_count{{{labels(method=method, route=route)}}} {count}')
+
+            family('employees_db_statements_total', 'counter', 'SQL statements executed while handling requests.')
+            for (method, route), (count, seconds) in sorted(self.statements.items()):
+                lines.append(f'employees_db_statements_total{{{labels(method=method, route=route)}}} {count}')
+            family('employees_db_statement_seconds_total', 'counter', 'Time spent executing SQL statements for requests.')
+            for (method, route), (count, seconds) in sorted(self.statements.items()):
+                lines.append(f'employees_db_statement_seconds_total{{{labels(method=method, route=route)}}} {seconds}')
+
+            for counter, value in sorted(self.counters.items()):
+                family(f'employees_{counter}_total', 'counter', f'Number of {counter.replace("_", " ")}.')
+                lines.append(f'employees_{counter}_total {value}')
+
+        cache_stats = response_cache.snapshot()
+        for stat in ('hits', 'misses', 'not_modified', 'invalidations', 'evictions'):
+            family(f'employees_response_cache_{stat}_total', 'counter', f'Response cache {stat.replace("_", " ")}.')
+            lines.append(f'employees_response_cache_{stat}_total {cache_stats[stat]}')
+        family('employees_response_cache_entries', 'gauge', 'Responses currently cached.')
+        lines.append(f'employees_response_cache_entries {cache_stats["entries"]}')
+        return '\n'.join(lines) + '\n'
+
+def labels(**values):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values.values())
+    return ','.join(f'{name}="{value}"' for name, value in zip(values, escaped))
+
+metrics = Metrics()
+
+def log_event(event, **fields):
+    app.logger.warning(json.dumps({'event': event, **fields}, default=str))
+
+class InstrumentedConnection:
+    # Wraps a sqlite3 connection to time every statement and charge it to the current request
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def execute(self, sql, parameters=()):
+        return self._timed(self._conn.execute, sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self._timed(self._conn.executemany, sql, parameters)
+
+    def _timed(self, method, sql, parameters):
+        started = time.perf_counter()
+        try:
+            return method(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            if has_app_context() and 'sql_count' in g:
+                g.sql_count += 1
+                g.sql_seconds += elapsed
+            if elapsed > app.config['SLOW_QUERY_THRESHOLD']:
+                metrics.increment('slow_queries')
+                log_event('slow_query', seconds=round(elapsed, 6), sql=' '.join(sql.split()))
+
+def profile_requested():
+    token = app.config['PROFILE_TOKEN']
+    header = request.headers.get('X-Profile')
+    return bool(token and header) and hmac.compare_digest(header.encode(), token.encode())
+
+def prune_profiles(profile_dir):
+    # Keep only the newest PROFILE_MAX_FILES dumps so profiling cannot fill the disk
+    profiles = []
+    with os.scandir(profile_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.prof'):
+                try:
+                    profiles.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass  # another worker pruned it first
+    profiles.sort()
+    for _, path in profiles[:max(0, len(profiles) - app.config['PROFILE_MAX_FILES'])]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.sql_count = 0
+    g.sql_seconds = 0.0
+
+    # Optional cProfile capture, sampled or forced by sending the configured token in X-Profile
+    profile_dir = app.config['PROFILE_DIR']
+    if profile_dir and (profile_requested() or random.random() < app.config['PROFILE_SAMPLE_RATE']):
+        g.profiler = cProfile.Profile()
+        try:
+            g.profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            g.pop('profiler')
+
+@app.after_request
+def record_request_metrics(response):
+    # Streamed responses are measured up to the point the body starts streaming
+    if 'request_started' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        profile_path = os.path.join(app.config['PROFILE_DIR'],
+                                    f"{time.strftime('%Y%m%dT%H%M%S')}-{request.endpoint or 'unmatched'}-{os.getpid()}-{threading.get_ident()}.prof")
+        # A profile that cannot be written must not replace the real response
+        try:
+            os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+            profiler.dump_stats(profile_path)
+            prune_profiles(app.config['PROFILE_DIR'])
+        except OSError as error:
+            log_event('profile_failed', path=profile_path, error=repr(error))
+        else:
+            metrics.increment('profiles')
+            response.headers['X-Profile-Path'] = profile_path
+
+    size = None if response.is_streamed else response.calculate_content_length()
+    metrics.observe_request(request.method, route, response.status_code, elapsed, size, g.sql_count, g.sql_seconds)
+    response.headers['Server-Timing'] = f'app;dur={elapsed * 1000:.2f}, db;dur={g.sql_seconds * 1000:.2f}'
+    if elapsed > app.config['SLOW_REQUEST_THRESHOLD']:
+        metrics.increment('slow_requests')
+        log_event('slow_request', method=request.method, path=request.full_path, route=route,
+                  status=response.status_code, seconds=round(elapsed, 6),
+                  sql_statements=g.sql_count, sql_seconds=round(g.sql_seconds, 6))
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Group commit
+# With GROUP_COMMIT enabled, writes are handed to a single writer thread per database.
+# It collects whatever arrives within GROUP_COMMIT_WINDOW and commits it as one
+# transaction. Each write runs in its own savepoint, so a failing write is rolled back
+# alone. Callers block until the shared commit has finished.
+class GroupCommitWriter:
+    def __init__(self, database, window, max_batch):
+        self.database = database
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='group-commit-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, operation):
+        future = Future()
+        self._queue.put((operation, future))
+        try:
+            # Bounded like a direct write waiting on the busy timeout, so a stuck writer cannot hang requests
+            return future.result(timeout=app.config['DB_BUSY_TIMEOUT'] + self.window)
+        except TimeoutError:
+            if future.cancel():
+                raise TimeoutError('Timed out waiting for the group commit writer') from None
+            # Already part of a transaction; it finishes or fails on its own busy timeout
+            return future.result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = None
+        while True:
+            # Writes whose caller gave up waiting are dropped before they run
+            batch = [(operation, future) for operation, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            if conn is None:
+                # Opened here rather than up front so a failure is reported to the waiting
+                # requests and retried with the next batch instead of killing the thread
+                try:
+                    conn = InstrumentedConnection(open_db_connection(self.database))
+                except Exception as error:
+                    log_event('group_commit_connect_failed', database=self.database, error=repr(error))
+                    for operation, future in batch:
+                        future.set_exception(error)
+                    continue
+            outcomes = []
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                for operation, future in batch:
+                    conn.execute('SAVEPOINT group_commit_write')
+                    try:
+                        outcomes.append((future, operation(conn), None))
+                    except Exception as error:
+                        conn.execute('ROLLBACK TO group_commit_write')
+                        outcomes.append((future, None, error))
+                    conn.execute('RELEASE group_commit_write')
+                conn.commit()
+            except Exception as error:
+                if conn.in_transaction:
+                    conn.rollback()
+                for operation, future in batch:
+                    future.set_exception(error)
+                continue
+            # Results are only handed back once the commit has succeeded
+            for future, result, error in outcomes:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+_group_commit_writers = {}
+_group_commit_lock = threading.Lock()
+
+def get_group_commit_writer(database):
+    # Started lazily so that each forked worker process gets its own writer thread
+    with _group_commit_lock:
+        if database not in _group_commit_writers:
+            _group_commit_writers[database] = GroupCommitWriter(
+                database, app.config['GROUP_COMMIT_WINDOW'], app.config['GROUP_COMMIT_MAX_BATCH'])
+        return _group_commit_writers[database]
+
+def run_write(operation):
+    # Runs operation(conn) in a write transaction and returns its result
+    if app.config['GROUP_COMMIT']:
+        database = app.config['DATABASE']
+        ensure_db_initialized(database)
+        return get_group_commit_writer(database).submit(operation)
+    with write_transaction() as conn:
+        return operation(conn)
+
+# Response cache
+# Serialized GET responses are kept in a bounded LRU. Writes in this process invalidate
+# the affected entries straight away; writes from other workers are picked up once an
+# entry is older than the TTL, when it is revalidated against the change counter table.
+class ResponseCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0  # bumped by every invalidation
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, generation):
+        # generation is the value seen before rendering; if a write invalidated the cache since,
+        # the body may predate it and is not stored
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, *tags):
+        # No tags drops everything
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if not tags or entry['tags'] & set(tags)]
+            for key in keys:
+                del self._entries[key]
+            self.generation += 1
+            self.stats['invalidations'] += len(keys)
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), max_entries=self.max_entries)
+
+response_cache = ResponseCache(app.config['RESPONSE_CACHE_SIZE'])
+
+def employee_cache_tag(employee_id):
+    return f'employee:{int(employee_id)}'
+
+def invalidate_employee_cache(employee_id=None):
+    # Any write can change list pages and stats; only the written employee's own pages are affected otherwise
+    tags = ['list', 'stats']
+    if employee_id is not None:
+        tags.append(employee_cache_tag(employee_id))
+    response_cache.invalidate(*tags)
+
+def read_change_counter():
+    return get_db_connection().execute('SELECT version, updated_at FROM change_counter WHERE id = 1').fetchone()
+
+def cached_response(tags):
+    # tags(**view_args) names what the response depends on, for invalidation
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            key = request.full_path
+            entry = response_cache.get(key)
+            if entry is None or time.monotonic() - entry['stored_at'] > app.config['RESPONSE_CACHE_TTL']:
+                # Taken before the counter is read so a write landing while we render is noticed
+                generation = response_cache.generation
+                counter = read_change_counter()
+                etag = f"v{counter['version']}"
+                if entry is not None and entry['etag'] == etag:
+                    entry['stored_at'] = time.monotonic()
+                else:
+                    # The ETag is shared by every URL, so a matching If-None-Match alone does not
+                    # prove this URL would be a 200; render it and let make_conditional decide
+                    response_cache.count('misses')
+                    response = app.make_response(view(**kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    entry = {
+                        'body': response.get_data(),
+                        'mimetype': response.mimetype,
+                        'etag': etag,
+                        'last_modified': counter['updated_at'],
+                        'tags': set(tags(**kwargs)),
+                        'stored_at': time.monotonic(),
+                    }
+                    response_cache.set(key, entry, generation)
+                    return cache_headers(response, etag, entry['last_modified']).make_conditional(request)
+
+            response = Response(entry['body'], mimetype=entry['mimetype'])
+            response = cache_headers(response, entry['etag'], entry['last_modified']).make_conditional(request)
+            response_cache.count('not_modified' if response.status_code == 304 else 'hits')
+            return response
+        return wrapper
+    return decorator
+
+def cache_headers(response, etag, last_modified):
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    # Clients and the CDN may keep the response but must revalidate it with the ETag
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 # Input validation functions
 def validate_employee(employee):
     required_fields = {'name', 'position', 'department', 'contact'}
@@ -24,22 +513,187 @@ def validate_employee(employee):
     return True, None
 
 def validate_employee_id(employee_id):
-    if not employee_id.isdigit():
+    if parse_integer(employee_id) is None:
         return False, "Employee ID must be an integer"
     return True, None
 
+# Listing / pagination settings
+EMPLOYEE_COLUMNS = ('id', 'name', 'position', 'department', 'contact', 'active')
+EMPLOYEE_FIELDS = EMPLOYEE_COLUMNS + ('performance_reviews',)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_FORMATS = {'ndjson': 'application/x-ndjson', 'json': 'application/json'}
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+STREAM_CHUNK_SIZE = 500
+EMPLOYEE_SORTS = ('id', 'name', 'position', 'department')
+ACTIVE_VALUES = {'true': 1, '1': 1, 'false': 0, '0': 0}
+SQLITE_MAX_INTEGER = 2 ** 63 - 1
+
+# Batch import settings
+BATCH_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+BATCH_OPERATIONS = ('create', 'update', 'deactivate', 'review')
+BATCH_CHUNK_SIZE = 1000
+
+def parse_fields(raw_fields):
+    if not raw_fields:
+        return list(EMPLOYEE_FIELDS), None
+    fields = [field.strip() for field in raw_fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in EMPLOYEE_FIELDS]
+    if unknown:
+        return None, f"Unknown field(s): {', '.join(unknown)}"
+    # The id is always returned since it doubles as the pagination cursor
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return list(dict.fromkeys(fields)), None
+
+def parse_integer(raw_value):
+    # Non-negative integers that fit in SQLite; isdigit() alone also accepts characters like '²'
+    if not (raw_value.isascii() and raw_value.isdigit()) or int(raw_value) > SQLITE_MAX_INTEGER:
+        return None
+    return int(raw_value)
+
+def parse_limit(raw_limit, default):
+    if raw_limit is None:
+        return default, None
+    limit = parse_integer(raw_limit)
+    if limit is None or limit < 1:
+        return None, "Limit must be a positive integer"
+    return min(limit, MAX_PAGE_SIZE), None
+
+def parse_cursor(raw_cursor):
+    if raw_cursor is None:
+        return None, None
+    cursor = parse_integer(raw_cursor)
+    if cursor is None:
+        return None, "Cursor must be an integer ID"
+    return cursor, None
+
+def parse_sort(raw_sort):
+    if not raw_sort:
+        return ('id', 'ASC'), None
+    column = raw_sort[1:] if raw_sort.startswith('-') else raw_sort
+    if column not in EMPLOYEE_SORTS:
+        return None, f"Sort must be one of: {', '.join(EMPLOYEE_SORTS)} (prefix with '-' for descending)"
+    return (column, 'DESC' if raw_sort.startswith('-') else 'ASC'), None
+
+# Cursors for id order are plain ids; other orders need the sort value as well,
+# so they are an opaque token holding [sort value, id]
+def encode_sort_cursor(employee, sort_column):
+    if sort_column == 'id':
+        return employee['id']
+    token = json.dumps([employee[sort_column], employee['id']])
+    return base64.urlsafe_b64encode(token.encode()).decode()
+
+def parse_sort_cursor(raw_cursor, sort_column):
+    if sort_column == 'id' or raw_cursor is None:
+        return parse_cursor(raw_cursor)
+    try:
+        value, employee_id = json.loads(base64.urlsafe_b64decode(raw_cursor.encode()))
+    except (ValueError, TypeError):
+        return None, "Invalid cursor"
+    # Cursors come back from clients, so check they still bind as SQLite values
+    if not isinstance(value, str) or type(employee_id) is not int or not 0 <= employee_id <= SQLITE_MAX_INTEGER:
+        return None, "Invalid cursor"
+    return (value, employee_id), None
+
+def build_employee_filters(args):
+    conditions, params = [], []
+    for column in ('department', 'position'):
+        value = args.get(column)
+        if value is not None:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+
+    raw_active = args.get('active')
+    if raw_active is not None:
+        if raw_active.lower() not in ACTIVE_VALUES:
+            return None, None, "Active must be true or false"
+        conditions.append('active = ?')
+        params.append(ACTIVE_VALUES[raw_active.lower()])
+
+    search = args.get('q')
+    if search is not None:
+        terms = re.findall(r'\w+', search)
+        if not terms:
+            return None, None, "Search query must contain letters or digits"
+        # The FTS5 check is only known once the schema is set up, which may not have happened
+        # yet if this is the first request in the process
+        database = app.config['DATABASE']
+        ensure_db_initialized(database)
+        if database in _fts_databases:
+            # Quote each term so user input cannot inject FTS syntax; all terms must prefix-match
+            conditions.append('rowid IN (SELECT rowid FROM employees_fts WHERE employees_fts MATCH ?)')
+            params.append(' '.join(f'"{term}"*' for term in terms))
+        else:
+            for term in terms:
+                conditions.append('(name LIKE ? OR position LIKE ? OR department LIKE ? OR contact LIKE ?)')
+                params.extend([f'%{term}%'] * 4)
+    return conditions, params, None
+
 # Utility functions
 def get_employee_by_id(employee_id):
     conn = get_db_connection()
-    employee = conn.execute('SELECT * FROM employees WHERE id = ?', (employee_id,)).fetchone()
-    conn.close()
-    return employee
+    employee = conn.execute(f'SELECT {", ".join(EMPLOYEE_COLUMNS)} FROM employees WHERE id = ?', (employee_id,)).fetchone()
+    if not employee:
+        return None
+    return serialize_employees(conn, [employee], EMPLOYEE_FIELDS)[0]
+
+def load_reviews(conn, employee_ids):
+    # One query for a whole page of employees, keyed by integer employee id
+    reviews = {int(employee_id): [] for employee_id in employee_ids}
+    if reviews:
+        placeholders = ', '.join('?' * len(reviews))
+        rows = conn.execute(f'''
+            SELECT employee_id, review FROM performance_reviews
+            WHERE employee_id IN ({placeholders})
+            ORDER BY id
+        ''', list(reviews))
+        for row in rows:
+            reviews[row['employee_id']].append(row['review'])
+    return reviews
+
+def serialize_employees(conn, employees, fields):
+    columns = [field for field in fields if field in EMPLOYEE_COLUMNS]
+    employees_list = [{column: employee[column] for column in columns} for employee in employees]
+    if 'performance_reviews' in fields:
+        reviews = load_reviews(conn, [employee['id'] for employee in employees_list])
+        for employee in employees_list:
+            employee['performance_reviews'] = reviews[int(employee['id'])]
+    return employees_list
+
+def next_employee_id(conn):
+    # The id AUTOINCREMENT would hand out next. Only stable inside a write transaction,
+    # where it lets a batch assign a contiguous block of ids up front.
+    return conn.execute('''
+        SELECT MAX(
+            COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'employees'), 0),
+            COALESCE((SELECT MAX(id) FROM employees), 0)
+        ) + 1
+    ''').fetchone()[0]
+
+def next_page_link(endpoint, next_cursor, **values):
+    if next_cursor is None:
+        return None
+    next_args = request.args.to_dict()
+    next_args['after'] = next_cursor
+    return url_for(endpoint, **values, **next_args)
+
+def describe_error(error):
+    # str() rather than repr(): reprs of errors such as UnicodeDecodeError embed the raw request bytes
+    return f'{type(error).__name__}: {error}'
 
 def handle_invalid_data_response(message):
     return jsonify({"status": "error", "message": message}), 400
 
 @app.errorhandler(500)
 def handle_internal_error(error):
+    # Keep the response generic but record what actually failed. Flask has already logged the
+    # traceback of uncaught exceptions; ones caught in a handler are logged with theirs here.
+    original = getattr(error, 'original_exception', None) or error
+    metrics.increment('internal_errors')
+    app.logger.error(json.dumps({'event': 'internal_error', 'method': request.method, 'path': request.full_path,
+                                 'error': describe_error(original)}),
+                     exc_info=None if isinstance(error, HTTPException) else error)
     return jsonify({"status": "error", "message": "An internal error occurred"}), 500
 
 # Serve static files
@@ -58,19 +712,136 @@ def index(filename):
 
 # API endpoints
 @app.route("/api/v1/employees", methods=["GET"])
+@cached_response(lambda: ['list'])
 def get_employees():
+    fields, error = parse_fields(request.args.get('fields'))
+    if error:
+        return handle_invalid_data_response(error)
+    sort, error = parse_sort(request.args.get('sort'))
+    if error:
+        return handle_invalid_data_response(error)
+    sort_column, sort_direction = sort
+    after, error = parse_sort_cursor(request.args.get('after'), sort_column)
+    if error:
+        return handle_invalid_data_response(error)
+    conditions, params, error = build_employee_filters(request.args)
+    if error:
+        return handle_invalid_data_response(error)
+
+    stream_format = request.args.get('stream')
+    if stream_format is not None and stream_format not in STREAM_FORMATS:
+        return handle_invalid_data_response(f"Stream format must be one of: {', '.join(STREAM_FORMATS)}")
+
+    # Streams run to the end of the table unless a limit is given explicitly
+    limit, error = parse_limit(request.args.get('limit'), None if stream_format else DEFAULT_PAGE_SIZE)
+    if error:
+        return handle_invalid_data_response(error)
+
+    # The sort column is always selected so the next cursor can be built from it
+    columns = [field for field in fields if field in EMPLOYEE_COLUMNS]
+    if sort_column not in columns:
+        columns.append(sort_column)
+
+    operator = '<' if sort_direction == 'DESC' else '>'
+    order_by = f'{sort_column} {sort_direction}'
+    if sort_column == 'id':
+        if after is not None:
+            conditions.append(f'id {operator} ?')
+            params.append(after)
+    else:
+        order_by += f', id {sort_direction}'
+        if after is not None:
+            conditions.append(f'({sort_column}, id) {operator} (?, ?)')
+            params.extend(after)
+
+    query = f'SELECT {", ".join(columns)} FROM employees'
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += f' ORDER BY {order_by}'
+
+    if stream_format:
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return Response(stream_with_context(stream_employees(query, params, fields, stream_format)),
+                        mimetype=STREAM_FORMATS[stream_format])
+
     try:
+        # Fetch one extra row to find out whether there is a next page
         conn = get_db_connection()
-        employees = conn.execute('SELECT * FROM employees').fetchall()
-        conn.close()
-        employees_list = [dict(employee) for employee in employees]
-        for employee in employees_list:
-            employee['performance_reviews'] = json.loads(employee['performance_reviews'])
-        return jsonify({"status": "success", "data": employees_list}), 200
+        employees = conn.execute(query + ' LIMIT ?', params + [limit + 1]).fetchall()
+
+        has_more = len(employees) > limit
+        employees_list = serialize_employees(conn, employees[:limit], fields)
+
+        next_cursor = encode_sort_cursor(employees[limit - 1], sort_column) if has_more else None
+        links = {"next": next_page_link('get_employees', next_cursor)}
+        return jsonify({"status": "success", "data": employees_list, "next_cursor": next_cursor, "links": links}), 200
     except Exception as e:
         return handle_internal_error(e)
 
+def stream_employees(query, params, fields, stream_format):
+    conn = get_db_connection()
+    cursor = conn.execute(query, params)
+    try:
+        if stream_format == 'json':
+            yield '{"status": "success", "data": ['
+        elif stream_format == 'csv':
+            # The header goes out even when nothing matches
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            yield buffer.getvalue()
+        separator = ''
+        while True:
+            employees = cursor.fetchmany(STREAM_CHUNK_SIZE)
+            if not employees:
+                break
+            employees_list = serialize_employees(conn, employees, fields)
+            if stream_format == 'ndjson':
+                yield ''.join(json.dumps(employee) + '\n' for employee in employees_list)
+            elif stream_format == 'csv':
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(employees_list)
+                yield buffer.getvalue()
+            else:
+                chunk = ','.join(json.dumps(employee) for employee in employees_list)
+                yield separator + chunk
+                separator = ','
+        if stream_format == 'json':
+            yield ']}'
+    finally:
+        cursor.close()
+
+@app.route("/api/v1/employees/export", methods=["GET"])
+def export_employees():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return handle_invalid_data_response(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    default_fields = ','.join(EMPLOYEE_COLUMNS) if export_format == 'csv' else None
+    fields, error = parse_fields(request.args.get('fields', default_fields))
+    if error:
+        return handle_invalid_data_response(error)
+    if export_format == 'csv' and 'performance_reviews' in fields:
+        return handle_invalid_data_response("CSV export cannot include performance_reviews")
+    conditions, params, error = build_employee_filters(request.args)
+    if error:
+        return handle_invalid_data_response(error)
+
+    columns = [field for field in fields if field in EMPLOYEE_COLUMNS]
+    query = f'SELECT {", ".join(columns)} FROM employees'
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY id'
+    response = Response(stream_with_context(stream_employees(query, params, fields, export_format)),
+                        mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename=employees.{export_format}'
+    return response
+
 @app.route("/api/v1/employees/<int:employeeId>", methods=["GET"])
+@cached_response(lambda employeeId: [employee_cache_tag(employeeId)])
 def get_employee(employeeId):
     is_valid, error = validate_employee_id(str(employeeId))
     if not is_valid:
@@ -80,9 +851,7 @@ def get_employee(employeeId):
     if not employee:
         return jsonify({"status": "error", "message": "Employee not found"}), 404
     
-    employee_data = dict(employee)
-    employee_data['performance_reviews'] = json.loads(employee_data['performance_reviews'])
-    return jsonify({"status": "success", "data": employee_data}), 200
+    return jsonify({"status": "success", "data": employee}), 200
 
 @app.route("/api/v1/employees", methods=["POST"])
 def add_employee():
@@ -91,21 +860,17 @@ def add_employee():
     if not is_valid:
         return handle_invalid_data_response(error)
     
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT MAX(id) FROM employees')
-        max_id = cursor.fetchone()[0]
-        employee_id = (int(max_id) if max_id else 0) + 1
+    def insert_employee(conn):
+        return conn.execute('''
+            INSERT INTO employees (name, position, department, contact, active)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (employee['name'], employee['position'], employee['department'], employee['contact'], True)).lastrowid
 
-        cursor.execute('''
-            INSERT INTO employees (id, name, position, department, contact, active, performance_reviews)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (employee_id, employee['name'], employee['position'], employee['department'], employee['contact'], True, json.dumps([])))
-        
-        conn.commit()
-        conn.close()
+    try:
+        # The id comes from the INSERT itself, so concurrent creates cannot collide
+        employee_id = run_write(insert_employee)
         
+        invalidate_employee_cache(employee_id)
         employee['id'] = employee_id
         employee['performance_reviews'] = []
         return jsonify({"status": "success", "data": employee}), 201
@@ -117,28 +882,30 @@ def update_employee(employeeId):
     is_valid, error = validate_employee_id(str(employeeId))
     if not is_valid:
         return handle_invalid_data_response(error)
-    
-    employee = get_employee_by_id(employeeId)
-    if not employee:
-        return jsonify({"status": "error", "message": "Employee not found"}), 404
 
     employee_data = request.json
     is_valid, error = validate_employee(employee_data)
     if not is_valid:
         return handle_invalid_data_response(error)
     
-    try:
-        conn = get_db_connection()
-        conn.execute('''
+    def update(conn):
+        cursor = conn.execute('''
             UPDATE employees
             SET name = ?, position = ?, department = ?, contact = ?
             WHERE id = ?
         ''', (employee_data['name'], employee_data['position'], employee_data['department'], employee_data['contact'], employeeId))
-        conn.commit()
-        conn.close()
+        if cursor.rowcount == 0:
+            return None
+        return load_reviews(conn, [employeeId])[employeeId]
+
+    try:
+        reviews = run_write(update)
+        if reviews is None:
+            return jsonify({"status": "error", "message": "Employee not found"}), 404
         
+        invalidate_employee_cache(employeeId)
         employee_data['id'] = employeeId
-        employee_data['performance_reviews'] = json.loads(employee['performance_reviews'])
+        employee_data['performance_reviews'] = reviews
         return jsonify({"status": "success", "data": employee_data}), 200
     except Exception as e:
         return handle_internal_error(e)
@@ -149,16 +916,12 @@ def delete_employee(employeeId):
     if not is_valid:
         return handle_invalid_data_response(error)
     
-    employee = get_employee_by_id(employeeId)
-    if not employee:
-        return jsonify({"status": "error", "message": "Employee not found"}), 404
-    
     try:
-        conn = get_db_connection()
-        conn.execute('DELETE FROM employees WHERE id = ?', (employeeId,))
-        conn.commit()
-        conn.close()
+        deleted = run_write(lambda conn: conn.execute('DELETE FROM employees WHERE id = ?', (employeeId,)).rowcount)
+        if deleted == 0:
+            return jsonify({"status": "error", "message": "Employee not found"}), 404
         
+        invalidate_employee_cache(employeeId)
         return jsonify({"status": "success", "message": "Employee deleted"}), 204
     except Exception as e:
         return handle_internal_error(e)
@@ -169,56 +932,268 @@ def add_performance_review(employeeId):
     if not is_valid:
         return handle_invalid_data_response(error)
     
-    employee = get_employee_by_id(employeeId)
-    if not employee:
-        return jsonify({"status": "error", "message": "Employee not found"}), 404
-    
     review = request.json.get('review')
     if not review or not isinstance(review, str):
         return handle_invalid_data_response("Review is required and must be a string")
     
     try:
-        reviews = json.loads(employee['performance_reviews'])
-        reviews.append(review)
-        
-        conn = get_db_connection()
-        conn.execute('''
-            UPDATE employees
-            SET performance_reviews = ?
-            WHERE id = ?
-        ''', (json.dumps(reviews), employeeId))
-        conn.commit()
-        conn.close()
+        # Appending is a single-row insert; it matches nothing if the employee does not exist
+        inserted = run_write(lambda conn: conn.execute('''
+            INSERT INTO performance_reviews (employee_id, review)
+            SELECT id, ? FROM employees WHERE id = ?
+        ''', (review, employeeId)).rowcount)
+        if inserted == 0:
+            return jsonify({"status": "error", "message": "Employee not found"}), 404
         
+        invalidate_employee_cache(employeeId)
         return jsonify({"status": "success", "message": "Review added"}), 201
     except Exception as e:
         return handle_internal_error(e)
 
+@app.route("/api/v1/employees/<int:employeeId>/reviews", methods=["GET"])
+@cached_response(lambda employeeId: [employee_cache_tag(employeeId)])
+def get_performance_reviews(employeeId):
+    is_valid, error = validate_employee_id(str(employeeId))
+    if not is_valid:
+        return handle_invalid_data_response(error)
+    after, error = parse_cursor(request.args.get('after'))
+    if error:
+        return handle_invalid_data_response(error)
+    limit, error = parse_limit(request.args.get('limit'), DEFAULT_PAGE_SIZE)
+    if error:
+        return handle_invalid_data_response(error)
+
+    try:
+        conn = get_db_connection()
+        if not conn.execute('SELECT 1 FROM employees WHERE id = ?', (employeeId,)).fetchone():
+            return jsonify({"status": "error", "message": "Employee not found"}), 404
+
+        reviews = conn.execute('''
+            SELECT id, review, created_at FROM performance_reviews
+            WHERE employee_id = ? AND id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (employeeId, after or 0, limit + 1)).fetchall()
+
+        has_more = len(reviews) > limit
+        reviews_list = [dict(review) for review in reviews[:limit]]
+
+        next_cursor = reviews_list[-1]['id'] if has_more else None
+        links = {"next": next_page_link('get_performance_reviews', next_cursor, employeeId=employeeId)}
+        return jsonify({"status": "success", "data": reviews_list, "next_cursor": next_cursor, "links": links}), 200
+    except Exception as e:
+        return handle_internal_error(e)
+
 @app.route("/api/v1/employees/<int:employeeId>/deactivate", methods=["PATCH"])
 def deactivate_employee(employeeId):
     is_valid, error = validate_employee_id(str(employeeId))
     if not is_valid:
         return handle_invalid_data_response(error)
     
-    employee = get_employee_by_id(employeeId)
-    if not employee:
-        return jsonify({"status": "error", "message": "Employee not found"}), 404
-    
     try:
-        conn = get_db_connection()
-        conn.execute('''
+        updated = run_write(lambda conn: conn.execute('''
             UPDATE employees
             SET active = ?
             WHERE id = ?
-        ''', (False, employeeId))
-        conn.commit()
-        conn.close()
+        ''', (False, employeeId)).rowcount)
+        if updated == 0:
+            return jsonify({"status": "error", "message": "Employee not found"}), 404
         
+        invalidate_employee_cache(employeeId)
         return jsonify({"status": "success", "message": "Employee deactivated"}), 200
     except Exception as e:
         return handle_internal_error(e)
 
+@app.route("/api/v1/employees:batch", methods=["POST"])
+def batch_employees():
+    if request.mimetype not in BATCH_MIMETYPES:
+        return jsonify({"status": "error", "message": f"Content-Type must be one of: {', '.join(BATCH_MIMETYPES)}"}), 415
+    rows, error = read_batch_rows(request.mimetype)
+    if error:
+        return handle_invalid_data_response(error)
+
+    # Rows are validated as they are read and written in chunks, each chunk in one transaction
+    results = []
+    chunk = []
+    read_error = None
+    rows_read = 0
+    try:
+        for index, row in enumerate(rows):
+            rows_read = index + 1
+            operation, error = validate_batch_row(row)
+            if error:
+                results.append({"index": index, "status": "error", "message": error})
+                continue
+            chunk.append((index, operation, row))
+            if len(chunk) >= BATCH_CHUNK_SIZE:
+                results.extend(apply_batch_chunk(chunk))
+                chunk = []
+    except (UnicodeDecodeError, csv.Error) as error:
+        # Streamed bodies can turn out to be malformed part way through, after earlier chunks
+        # were committed; the rows read so far are still applied and reported
+        read_error = f"Could not read the request body after {rows_read} rows: {error}"
+    if chunk:
+        results.extend(apply_batch_chunk(chunk))
+
+    results.sort(key=lambda result: result['index'])
+    succeeded = sum(1 for result in results if result['status'] == 'success')
+    summary = {"total": len(results), "succeeded": succeeded, "failed": len(results) - succeeded}
+    if read_error:
+        return jsonify({"status": "error", "message": read_error, "data": results, "summary": summary}), 400
+    return jsonify({"status": "success", "data": results, "summary": summary}), 200
+
+def read_batch_rows(mimetype):
+    if mimetype == 'application/json':
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            return None, "Request body must be a JSON array"
+        return rows, None
+
+    # NDJSON and CSV are read line by line straight off the request stream
+    stream = io.BufferedReader(request.stream)
+    if mimetype == 'text/csv':
+        # Quoted CSV fields may span lines, so decoding is left to the text wrapper
+        text_stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        return (parse_csv_row(row) for row in csv.DictReader(text_stream)), None
+    # NDJSON lines are decoded one at a time so a bad line is only that row's error
+    return (parse_ndjson_line(line) for line in stream if line.strip()), None
+
+def parse_ndjson_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Includes UnicodeDecodeError for lines that are not UTF-8
+        return None
+
+def parse_csv_row(row):
+    # Empty op/id cells mean "create" and "no id" rather than empty strings
+    return {key: value for key, value in row.items() if not (key in ('op', 'id') and value == '')}
+
+def validate_batch_row(row):
+    if not isinstance(row, dict):
+        return None, "Row must be a JSON object"
+    operation = row.get('op', 'create')
+    if operation not in BATCH_OPERATIONS:
+        return None, f"Operation must be one of: {', '.join(BATCH_OPERATIONS)}"
+
+    if operation != 'create':
+        if 'id' not in row:
+            return None, "Employee ID is required"
+        is_valid, error = validate_employee_id(str(row['id']))
+        if not is_valid:
+            return None, error
+    if operation in ('create', 'update'):
+        is_valid, error = validate_employee(row)
+        if not is_valid:
+            return None, error
+    if operation == 'review':
+        review = row.get('review')
+        if not review or not isinstance(review, str):
+            return None, "Review is required and must be a string"
+    return operation, None
+
+def apply_batch_chunk(chunk):
+    try:
+        results = run_write(lambda conn: write_batch_chunk(conn, chunk))
+    except Exception as error:
+        # The whole chunk was rolled back; keep the traceback since the rows only get a generic message
+        metrics.increment('internal_errors')
+        app.logger.exception(json.dumps({'event': 'batch_chunk_failed', 'first_index': chunk[0][0],
+                                         'rows': len(chunk), 'error': describe_error(error)}))
+        return [{"index": index, "status": "error", "message": "An internal error occurred"} for index, _, _ in chunk]
+    # Invalidate per committed chunk so a request that fails later cannot leave stale pages cached
+    response_cache.invalidate()
+    return [results[index] for index, _, _ in chunk]
+
+def write_batch_chunk(conn, chunk):
+    # Creates are applied first so later rows in the same chunk can refer to them
+    results = {}
+    creates = [(index, row) for index, operation, row in chunk if operation == 'create']
+    first_id = next_employee_id(conn)
+    conn.executemany('''
+        INSERT INTO employees (id, name, position, department, contact, active)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(first_id + offset, row['name'], row['position'], row['department'], row['contact'], True)
+          for offset, (index, row) in enumerate(creates)])
+    for offset, (index, row) in enumerate(creates):
+        results[index] = {"index": index, "status": "success", "id": first_id + offset}
+
+    # One lookup for every id the remaining rows touch
+    target_ids = list({int(row['id']) for index, operation, row in chunk if operation != 'create'})
+    existing_ids = set()
+    if target_ids:
+        placeholders = ', '.join('?' * len(target_ids))
+        existing_ids = {int(employee['id']) for employee in
+                        conn.execute(f'SELECT id FROM employees WHERE id IN ({placeholders})', target_ids)}
+
+    updates, deactivations, reviews = [], [], []
+    for index, operation, row in chunk:
+        if operation == 'create':
+            continue
+        employee_id = int(row['id'])
+        if employee_id not in existing_ids:
+            results[index] = {"index": index, "status": "error", "id": employee_id, "message": "Employee not found"}
+            continue
+        if operation == 'update':
+            updates.append((row['name'], row['position'], row['department'], row['contact'], employee_id))
+        elif operation == 'deactivate':
+            deactivations.append((False, employee_id))
+        else:
+            reviews.append((employee_id, row['review']))
+        results[index] = {"index": index, "status": "success", "id": employee_id}
+
+    conn.executemany('''
+        UPDATE employees
+        SET name = ?, position = ?, department = ?, contact = ?
+        WHERE id = ?
+    ''', updates)
+    conn.executemany('UPDATE employees SET active = ? WHERE id = ?', deactivations)
+    conn.executemany('INSERT INTO performance_reviews (employee_id, review) VALUES (?, ?)', reviews)
+    return results
+
+@app.route("/api/v1/stats", methods=["GET"])
+@cached_response(lambda: ['stats'])
+def get_stats():
+    group_by = request.args.get('group_by')
+    if group_by is not None and group_by not in STATS_GROUPS:
+        return handle_invalid_data_response(f"group_by must be one of: {', '.join(STATS_GROUPS)}")
+
+    try:
+        # Served from the summary table, so the cost is the number of groups, not employees
+        conn = get_db_connection()
+        rows = conn.execute('''
+            SELECT dimension, value, employees, active, reviews FROM employee_stats
+            WHERE dimension IN ('all', ?)
+            ORDER BY dimension, value
+        ''', (group_by or 'all',)).fetchall()
+
+        totals = {"employees": 0, "active": 0, "inactive": 0, "reviews": 0}
+        groups = []
+        for row in rows:
+            counts = {"employees": row['employees'], "active": row['active'],
+                      "inactive": row['employees'] - row['active'], "reviews": row['reviews']}
+            if row['dimension'] == 'all':
+                totals = counts
+            else:
+                value = row['value'] == '1' if group_by == 'active' else row['value']
+                groups.append({"group": value, **counts})
+
+        data = {"totals": totals}
+        if group_by:
+            data['group_by'] = group_by
+            data['groups'] = groups
+        return jsonify({"status": "success", "data": data}), 200
+    except Exception as e:
+        return handle_internal_error(e)
+
+@app.route("/api/v1/cache/stats", methods=["GET"])
+def get_cache_stats():
+    stats = response_cache.snapshot()
+    stats['ttl'] = app.config['RESPONSE_CACHE_TTL']
+    return jsonify({"status": "success", "data": stats}), 200
+
 @app.route("/employeeDetails.html")
+@cached_response(lambda: [employee_cache_tag(request.args['id'])])
 def employee_details():
     # Retrieve the 'id' from query parameters
     employee_id = request.args.get('id')
@@ -234,33 +1209,330 @@ def employee_details():
     if not employee:
         return jsonify({"status": "error", "message": "Employee not found"}), 404
     
-    # Convert employee data to a dictionary
-    employee_data = dict(employee)
-    employee_data['performance_reviews'] = json.loads(employee_data['performance_reviews'])
-    
     # Render the template and pass employee data to it
-    return render_template('employeeDetails.html', employee=employee_data)
+    return render_template('employeeDetails.html', employee=employee)
 
-def init_db():
-    conn = sqlite3.connect('employees.db')
+EMPLOYEES_TABLE_SQL = '''
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        position TEXT NOT NULL,
+        department TEXT NOT NULL,
+        contact TEXT,
+        active BOOLEAN NOT NULL
+    )
+'''
+
+def init_db(database=None):
+    conn = open_db_connection(database or app.config['DATABASE'])
     cursor = conn.cursor()
+    # Hold the write lock so concurrent workers do not migrate twice
+    cursor.execute('BEGIN IMMEDIATE')
     
     # Create employees table
+    cursor.execute(EMPLOYEES_TABLE_SQL.format(table='IF NOT EXISTS employees'))
+
+    # Create performance reviews table (append-only, one row per review)
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS employees (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            position TEXT NOT NULL,
-            department TEXT NOT NULL,
-            contact TEXT,
-            active BOOLEAN NOT NULL,
-            performance_reviews TEXT
+        CREATE TABLE IF NOT EXISTS performance_reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id INTEGER NOT NULL,
+            review TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
         )
     ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_performance_reviews_employee
+        ON performance_reviews (employee_id, id)
+    ''')
+
+    # Migrations rebuild the employees table, so they run before its indexes and triggers are created
+    migrate_review_blobs(cursor)
+    ids_migrated = migrate_employee_ids(cursor)
+    # Reviews go with their employee; BEFORE so the employee row is still visible to other triggers
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS employees_delete_reviews
+        BEFORE DELETE ON employees
+        BEGIN
+            DELETE FROM performance_reviews WHERE employee_id = OLD.id;
+        END
+    ''')
+
+    # Secondary indexes for filtering and sorting the employee list
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_department_active ON employees (department, active)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_active ON employees (active)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_position ON employees (position)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (name)')
+
+    # Table-level change counter behind ETags and cache revalidation, bumped by triggers
+    # so every writer (handlers, batch imports, other workers) is accounted for
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_counter (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    ''')
+    cursor.execute("""
+        INSERT OR IGNORE INTO change_counter (id, version, updated_at)
+        VALUES (1, 0, (julianday('now') - 2440587.5) * 86400.0)
+    """)
+    for table in ('employees', 'performance_reviews'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_change_counter_{event.lower()} AFTER {event} ON {table}
+                BEGIN
+                    UPDATE change_counter
+                    SET version = version + 1, updated_at = (julianday('now') - 2440587.5) * 86400.0
+                    WHERE id = 1;
+                END
+            ''')
+
+    if ids_migrated:
+        # Ids changed type, so cached representations and ETags are stale
+        bump_change_counter(cursor)
+
+    if init_search_index(cursor, rebuild=ids_migrated):
+        _fts_databases.add(database or app.config['DATABASE'])
+    init_stats(cursor)
     
     conn.commit()
     conn.close()
 
+def bump_change_counter(cursor):
+    # For writes the triggers do not see, so caches and ETags still move on
+    cursor.execute('''
+        UPDATE change_counter
+        SET version = version + 1, updated_at = (julianday('now') - 2440587.5) * 86400.0
+        WHERE id = 1
+    ''')
+
+def init_search_index(cursor, rebuild=False):
+    # Full-text index over the searchable columns, kept in sync by triggers.
+    # Returns False when this SQLite build lacks FTS5 and searches fall back to LIKE.
+    exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'").fetchone()
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+                name, position, department, contact,
+                content='employees', content_rowid='rowid'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        return False
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees
+        BEGIN
+            INSERT INTO employees_fts (rowid, name, position, department, contact)
+            VALUES (NEW.rowid, NEW.name, NEW.position, NEW.department, NEW.contact);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees
+        BEGIN
+            INSERT INTO employees_fts (employees_fts, rowid, name, position, department, contact)
+            VALUES ('delete', OLD.rowid, OLD.name, OLD.position, OLD.department, OLD.contact);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE OF name, position, department, contact ON employees
+        BEGIN
+            INSERT INTO employees_fts (employees_fts, rowid, name, position, department, contact)
+            VALUES ('delete', OLD.rowid, OLD.name, OLD.position, OLD.department, OLD.contact);
+            INSERT INTO employees_fts (rowid, name, position, department, contact)
+            VALUES (NEW.rowid, NEW.name, NEW.position, NEW.department, NEW.contact);
+        END
+    ''')
+    if rebuild or not exists:
+        cursor.execute("INSERT INTO employees_fts (employees_fts) VALUES ('rebuild')")
+    return True
+
+# Headcount summaries
+# employee_stats holds one row per (dimension, value): every department, every position,
+# active '1'/'0', and a single 'all' row for the totals. Triggers keep it up to date row
+# by row, so GET /api/v1/stats never aggregates the employees table.
+STATS_GROUPS = ('department', 'position', 'active')
+STATS_DIMENSIONS = {
+    'all': "''",
+    'department': '{row}.department',
+    'position': '{row}.position',
+    'active': "CASE WHEN {row}.active THEN '1' ELSE '0' END",
+}
+STATS_ACTIVE = 'CASE WHEN {row}.active THEN 1 ELSE 0 END'
+
+def stats_adjustment_sql(row, sign, reviews):
+    # Adds (sign=1) or removes (sign=-1) one employee's contribution to every group it is in
+    statements = []
+    active = STATS_ACTIVE.format(row=row)
+    for dimension, expression in STATS_DIMENSIONS.items():
+        value = expression.format(row=row)
+        if sign > 0:
+            statements.append(f'''
+                INSERT INTO employee_stats (dimension, value, employees, active, reviews)
+                VALUES ('{dimension}', {value}, 1, {active}, {reviews})
+                ON CONFLICT (dimension, value) DO UPDATE SET
+                    employees = employees + 1, active = active + excluded.active, reviews = reviews + excluded.reviews;
+            ''')
+        else:
+            statements.append(f'''
+                UPDATE employee_stats
+                SET employees = employees - 1, active = active - {active}, reviews = reviews - {reviews}
+                WHERE dimension = '{dimension}' AND value = {value};
+                DELETE FROM employee_stats WHERE dimension = '{dimension}' AND value = {value} AND employees = 0;
+            ''')
+    return ''.join(statements)
+
+def review_adjustment_sql(row, sign):
+    # Reviews count towards their employee's groups; the employee row still exists when
+    # reviews are removed because employees_delete_reviews runs BEFORE DELETE
+    return ''.join(f'''
+        UPDATE employee_stats SET reviews = reviews {'+' if sign > 0 else '-'} 1
+        WHERE dimension = '{dimension}'
+          AND value = (SELECT {expression.format(row='employees')} FROM employees WHERE id = {row}.employee_id);
+    ''' for dimension, expression in STATS_DIMENSIONS.items())
+
+def live_stats_sql(dimension):
+    expression = STATS_DIMENSIONS[dimension].format(row='employees')
+    return f'''
+        SELECT '{dimension}' AS dimension, {expression} AS value, COUNT(*) AS employees,
+               SUM({STATS_ACTIVE.format(row='employees')}) AS active,
+               SUM((SELECT COUNT(*) FROM performance_reviews WHERE employee_id = employees.id)) AS reviews
+        FROM employees
+        GROUP BY 2
+    '''
+
+def init_stats(cursor):
+    exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'employee_stats'").fetchone()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS employee_stats (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            employees INTEGER NOT NULL,
+            active INTEGER NOT NULL,
+            reviews INTEGER NOT NULL,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS employees_stats_insert AFTER INSERT ON employees
+        BEGIN
+            {stats_adjustment_sql('NEW', 1, '0')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS employees_stats_delete AFTER DELETE ON employees
+        BEGIN
+            {stats_adjustment_sql('OLD', -1, '0')}
+        END
+    ''')
+    employee_reviews = '(SELECT COUNT(*) FROM performance_reviews WHERE employee_id = NEW.id)'
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS employees_stats_update AFTER UPDATE OF department, position, active ON employees
+        WHEN OLD.department IS NOT NEW.department OR OLD.position IS NOT NEW.position OR OLD.active IS NOT NEW.active
+        BEGIN
+            {stats_adjustment_sql('OLD', -1, employee_reviews)}
+            {stats_adjustment_sql('NEW', 1, employee_reviews)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS performance_reviews_stats_insert AFTER INSERT ON performance_reviews
+        BEGIN
+            {review_adjustment_sql('NEW', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS performance_reviews_stats_delete AFTER DELETE ON performance_reviews
+        BEGIN
+            {review_adjustment_sql('OLD', -1)}
+        END
+    ''')
+    if not exists:
+        rebuild_stats(cursor)
+
+def rebuild_stats(cursor):
+    # Returns whether anything changed; served stats are cached, so a correction must bump the counter
+    if not find_stats_mismatches(cursor):
+        return False
+    cursor.execute('DELETE FROM employee_stats')
+    for dimension in STATS_DIMENSIONS:
+        cursor.execute(f'INSERT INTO employee_stats (dimension, value, employees, active, reviews) {live_stats_sql(dimension)}')
+    bump_change_counter(cursor)
+    return True
+
+def find_stats_mismatches(cursor):
+    # Compares the summary table with aggregates computed from the live tables
+    stored = {(row['dimension'], row['value']): tuple(row)[2:] for row in
+              cursor.execute('SELECT dimension, value, employees, active, reviews FROM employee_stats')}
+    live = {}
+    for dimension in STATS_DIMENSIONS:
+        for row in cursor.execute(live_stats_sql(dimension)):
+            live[(row['dimension'], row['value'])] = tuple(row)[2:]
+    return [{"dimension": dimension, "value": value, "stored": stored.get((dimension, value)), "live": live.get((dimension, value))}
+            for dimension, value in sorted(set(stored) | set(live)) if stored.get((dimension, value)) != live.get((dimension, value))]
+
+@app.cli.command('rebuild-stats')
+@click.option('--check-only', is_flag=True, help='Only compare the summaries with the live tables.')
+def rebuild_stats_command(check_only):
+    """Recompute the headcount summaries from scratch and verify them."""
+    database = app.config['DATABASE']
+    ensure_db_initialized(database)
+    conn = open_db_connection(database)
+    cursor = conn.cursor()
+    cursor.execute('BEGIN IMMEDIATE')
+    changed = False if check_only else rebuild_stats(cursor)
+    mismatches = find_stats_mismatches(cursor)
+    conn.commit()
+    conn.close()
+
+    for mismatch in mismatches:
+        click.echo(f"mismatch {mismatch['dimension']}={mismatch['value']!r}: stored {mismatch['stored']}, live {mismatch['live']}")
+    if mismatches:
+        raise SystemExit(1)
+    if changed:
+        click.echo('Stats rebuilt and verified')
+    else:
+        click.echo('Stats match the live tables')
+
+def migrate_review_blobs(cursor):
+    # Older databases keep reviews as a JSON array in employees.performance_reviews.
+    # Move them into the reviews table and null the column so this runs only once.
+    columns = [column['name'] for column in cursor.execute('PRAGMA table_info(employees)')]
+    if 'performance_reviews' not in columns:
+        return
+    employees = cursor.execute('''
+        SELECT id, performance_reviews FROM employees
+        WHERE performance_reviews IS NOT NULL
+    ''').fetchall()
+    cursor.executemany(
+        'INSERT INTO performance_reviews (employee_id, review) VALUES (?, ?)',
+        [(employee['id'], review) for employee in employees for review in json.loads(employee['performance_reviews'])]
+    )
+    cursor.execute('UPDATE employees SET performance_reviews = NULL WHERE performance_reviews IS NOT NULL')
+
+def migrate_employee_ids(cursor):
+    # Older databases key employees by TEXT (or by a plain INTEGER rowid that can reuse
+    # deleted ids). Copy them into the AUTOINCREMENT schema, converting ids to integers.
+    # Indexes and triggers on the old table are dropped with it and recreated by init_db().
+    table_sql = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'employees'").fetchone()[0]
+    if 'AUTOINCREMENT' in table_sql.upper():
+        return False
+    # CAST would quietly turn ids like 'E-9' into 0 and orphan their reviews, so refuse to guess
+    invalid_ids = [row[0] for row in cursor.execute(
+        'SELECT id FROM employees WHERE CAST(CAST(id AS INTEGER) AS TEXT) IS NOT id LIMIT 10'
+    )]
+    if invalid_ids:
+        cursor.connection.rollback()
+        raise RuntimeError(f"Cannot migrate employee ids to integers; fix these non-numeric ids first: {invalid_ids}")
+    cursor.execute('DROP TABLE IF EXISTS employees_migration')
+    cursor.execute(EMPLOYEES_TABLE_SQL.format(table='employees_migration'))
+    cursor.execute('''
+        INSERT INTO employees_migration (id, name, position, department, contact, active)
+        SELECT CAST(id AS INTEGER), name, position, department, contact, active FROM employees
+    ''')
+    cursor.execute('DROP TABLE employees')
+    cursor.execute('ALTER TABLE employees_migration RENAME TO employees')
+    return True
+
 if __name__ == "__main__":
     # Initialize the database
     init_db()
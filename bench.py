@@ -0,0 +1,405 @@
+"""Load-test and regression benchmark for the Employee Management API.
+
+    python bench.py seed --db bench.db --employees 100000 --max-reviews 5
+    python bench.py run --db bench.db --concurrency 8 --requests 20000 --write-ratio 0.1 --output run.json
+    python bench.py run --url http://localhost:5000 --server-pid 1234 --concurrency 32 --duration 60 --output run.json
+    python bench.py replay --db bench.db --traffic traffic.jsonl --output replay.json
+    python bench.py compare baseline.json run.json --latency-threshold 0.10 --memory-threshold 0.20
+"""
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEPARTMENTS = ('Engineering', 'Marketing', 'Sales', 'Finance', 'Support', 'People', 'Legal', 'Operations')
+POSITIONS = ('Engineer', 'Senior Engineer', 'Manager', 'Director', 'Analyst', 'Associate', 'Specialist', 'Lead')
+FIRST_NAMES = ('Jane', 'John', 'Ada', 'Alan', 'Grace', 'Linus', 'Luke', 'Leia', 'Ravi', 'Mei', 'Omar', 'Sofia')
+LAST_NAMES = ('Doe', 'Smith', 'Lovelace', 'Turing', 'Hopper', 'Torvalds', 'Skywalker', 'Patel', 'Chen', 'Garcia')
+REVIEWS = ('Great work ethic!', 'Hard worker!', 'Needs to improve punctuality.', 'Strong leadership skills.',
+           'Exceeded expectations this quarter.', 'Good collaborator.')
+SEED_CHUNK_SIZE = 10000
+
+# Read operations first; the write ratio picks between the two groups
+READ_OPERATIONS = ('list', 'list_filtered', 'search', 'get', 'reviews', 'details')
+WRITE_OPERATIONS = ('create', 'update', 'add_review', 'deactivate', 'delete')
+
+def random_employee(rng):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        'name': f'{first} {last}',
+        'position': rng.choice(POSITIONS),
+        'department': rng.choice(DEPARTMENTS),
+        'contact': f'{first.lower()}.{last.lower()}{rng.randrange(100000)}@example.com',
+    }
+
+def load_app(database):
+    # Imported lazily so HTTP runs do not need Flask installed
+    from app import app
+    app.config['DATABASE'] = database
+    return app
+
+# Seeding
+def seed(args):
+    from app import init_db, open_db_connection
+    init_db(args.db)
+    conn = open_db_connection(args.db)
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM employees").fetchone()[0]
+    remaining = args.employees
+    while remaining > 0:
+        count = min(SEED_CHUNK_SIZE, remaining)
+        employees, reviews = [], []
+        for employee_id in range(next_id, next_id + count):
+            employee = random_employee(rng)
+            employees.append((employee_id, employee['name'], employee['position'], employee['department'],
+                              employee['contact'], rng.random() > args.inactive_ratio))
+            for _ in range(rng.randint(0, args.max_reviews)):
+                reviews.append((employee_id, rng.choice(REVIEWS)))
+        with conn:
+            conn.executemany('''
+                INSERT INTO employees (id, name, position, department, contact, active)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', employees)
+            conn.executemany('INSERT INTO performance_reviews (employee_id, review) VALUES (?, ?)', reviews)
+        next_id += count
+        remaining -= count
+        print(f'seeded {args.employees - remaining}/{args.employees} employees', file=sys.stderr)
+    conn.close()
+    print(json.dumps({'employees': args.employees, 'seconds': round(time.perf_counter() - started, 2)}))
+
+# Request drivers
+class ClientDriver:
+    # Drives the app in-process through the Flask test client, one client per thread
+    def __init__(self, database):
+        self.app = load_app(database)
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        data = response.get_data()
+        return response.status_code, len(data), response.get_json(silent=True)
+
+class HttpDriver:
+    # Drives a running server over real HTTP, one keep-alive session per thread
+    def __init__(self, base_url):
+        import requests
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.requests.Session()
+        response = session.request(method, self.base_url + path, json=body)
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return response.status_code, len(response.content), payload
+
+def make_driver(args):
+    if args.url:
+        return HttpDriver(args.url)
+    return ClientDriver(args.db)
+
+# Workload
+class Workload:
+    def __init__(self, driver, write_ratio):
+        self.driver = driver
+        self.write_ratio = write_ratio
+        self._lock = threading.Lock()
+        self._created_ids = []
+        status, _, payload = driver.request('GET', '/api/v1/employees?sort=-id&limit=1&fields=id')
+        if status != 200 or not payload['data']:
+            raise SystemExit('The target has no employees; run "bench.py seed" first')
+        self.max_id = payload['data'][0]['id']
+
+    def pick_operation(self, rng):
+        if rng.random() < self.write_ratio:
+            return rng.choice(WRITE_OPERATIONS)
+        return rng.choice(READ_OPERATIONS)
+
+    def build_request(self, operation, rng):
+        employee_id = rng.randint(1, self.max_id)
+        if operation == 'list':
+            return 'GET', '/api/v1/employees?limit=50&fields=id,name,position,department,contact', None
+        if operation == 'list_filtered':
+            return 'GET', f'/api/v1/employees?limit=50&active=true&department={rng.choice(DEPARTMENTS)}', None
+        if operation == 'search':
+            return 'GET', f'/api/v1/employees?limit=50&q={rng.choice(LAST_NAMES)}&fields=id,name', None
+        if operation == 'get':
+            return 'GET', f'/api/v1/employees/{employee_id}', None
+        if operation == 'reviews':
+            return 'GET', f'/api/v1/employees/{employee_id}/reviews', None
+        if operation == 'details':
+            return 'GET', f'/employeeDetails.html?id={employee_id}', None
+        if operation == 'create':
+            return 'POST', '/api/v1/employees', random_employee(rng)
+        if operation == 'update':
+            return 'PUT', f'/api/v1/employees/{employee_id}', random_employee(rng)
+        if operation == 'add_review':
+            return 'POST', f'/api/v1/employees/{employee_id}/reviews', {'review': rng.choice(REVIEWS)}
+        if operation == 'deactivate':
+            return 'PATCH', f'/api/v1/employees/{employee_id}/deactivate', None
+        # Only delete employees this run created, so the seeded data set stays the same size.
+        # Until there are some, delete a missing id, which still exercises the route (404).
+        with self._lock:
+            employee_id = self._created_ids.pop() if self._created_ids else self.max_id + 1_000_000
+        return 'DELETE', f'/api/v1/employees/{employee_id}', None
+
+    def record_created(self, payload):
+        if payload and isinstance(payload.get('data'), dict) and 'id' in payload['data']:
+            with self._lock:
+                self._created_ids.append(payload['data']['id'])
+
+def timed_request(driver, method, path, body):
+    started = time.perf_counter()
+    try:
+        status, size, payload = driver.request(method, path, body)
+    except Exception:
+        status, size, payload = 0, 0, None
+    return time.perf_counter() - started, status, size, payload
+
+def run_workload(args):
+    driver = make_driver(args)
+    workload = Workload(driver, args.write_ratio)
+    samples = []
+    samples_lock = threading.Lock()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    issued = iter(range(args.requests)) if not args.duration else None
+    issued_lock = threading.Lock()
+
+    def worker(worker_index):
+        rng = random.Random(args.seed + worker_index)
+        local_samples = []
+        while True:
+            if deadline is not None:
+                if time.monotonic() >= deadline:
+                    break
+            else:
+                with issued_lock:
+                    if next(issued, None) is None:
+                        break
+            operation = workload.pick_operation(rng)
+            method, path, body = workload.build_request(operation, rng)
+            elapsed, status, size, payload = timed_request(driver, method, path, body)
+            if operation == 'create' and status == 201:
+                workload.record_created(payload)
+            local_samples.append((operation, elapsed, status, size))
+        with samples_lock:
+            samples.extend(local_samples)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(worker, range(args.concurrency)))
+    wall_time = time.perf_counter() - started
+    return build_report(args, samples, wall_time)
+
+def run_replay(args):
+    driver = make_driver(args)
+    entries, skipped = [], 0
+    with open(args.traffic) as traffic:
+        for line in traffic:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            # Lines without a method and path (e.g. backlog entries) are not HTTP traffic
+            if 'method' not in entry or 'path' not in entry:
+                skipped += 1
+                continue
+            entries.append(entry)
+    if not entries:
+        raise SystemExit(f'No replayable entries in {args.traffic} ({skipped} lines without method/path)')
+
+    samples = []
+    samples_lock = threading.Lock()
+
+    def replay(entry):
+        elapsed, status, size, _ = timed_request(driver, entry['method'].upper(), entry['path'], entry.get('json'))
+        with samples_lock:
+            samples.append((entry.get('name', f"{entry['method'].upper()} {entry['path'].split('?')[0]}"),
+                            elapsed, status, size))
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(replay, entries))
+    wall_time = time.perf_counter() - started
+    report = build_report(args, samples, wall_time)
+    report['config']['skipped_lines'] = skipped
+    return report
+
+# Reporting
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize(latencies, statuses, sizes, wall_time):
+    latencies = sorted(latencies)
+    errors = sum(1 for status in statuses if status == 0 or status >= 500)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / wall_time, 2) if wall_time else None,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else None,
+        'mean_response_bytes': round(sum(sizes) / len(sizes)) if sizes else None,
+        'status_counts': {str(status): statuses.count(status) for status in sorted(set(statuses))},
+    }
+
+def build_report(args, samples, wall_time):
+    operations = {}
+    for operation, elapsed, status, size in samples:
+        bucket = operations.setdefault(operation, ([], [], []))
+        bucket[0].append(elapsed)
+        bucket[1].append(status)
+        bucket[2].append(size)
+
+    config = {key: value for key, value in vars(args).items() if key != 'func'}
+    peak_rss_kb, peak_rss_source = peak_rss(args)
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'config': config,
+        'wall_time_s': round(wall_time, 3),
+        'peak_rss_kb': peak_rss_kb,
+        'peak_rss_source': peak_rss_source,
+        'overall': summarize([sample[1] for sample in samples], [sample[2] for sample in samples],
+                             [sample[3] for sample in samples], wall_time),
+        'operations': {operation: summarize(latencies, statuses, sizes, wall_time)
+                       for operation, (latencies, statuses, sizes) in sorted(operations.items())},
+    }
+
+def peak_rss(args):
+    # In-process runs measure this process, which hosts the app. For HTTP runs this process is only
+    # the load generator, so report the server's peak (Linux VmHWM) when its pid is given, else nothing.
+    if not args.url:
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1), 'bench process'
+    if args.server_pid is None:
+        return None, None
+    try:
+        with open(f'/proc/{args.server_pid}/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]), 'server'
+    except OSError as error:
+        print(f'cannot read memory of server pid {args.server_pid}: {error}', file=sys.stderr)
+    return None, None
+
+def write_report(report, output):
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as report_file:
+            report_file.write(text + '\n')
+    print(text)
+
+def peak_rss_source(report):
+    if not report.get('peak_rss_kb'):
+        return None
+    if 'peak_rss_source' in report:
+        return report['peak_rss_source']
+    # Older reports always measured the bench process, which is only the app for in-process runs
+    return None if report['config'].get('url') else 'bench process'
+
+def compare(args):
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current) as current_file:
+        current = json.load(current_file)
+
+    regressions = []
+
+    def check(label, before, after, threshold):
+        if before and after and after > before * (1 + threshold):
+            regressions.append(f'{label}: {before} -> {after} (+{(after / before - 1) * 100:.1f}%, limit {threshold * 100:.0f}%)')
+
+    for operation, after in current['operations'].items():
+        before = baseline['operations'].get(operation)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            check(f'{operation} {metric}', before[metric], after[metric], args.latency_threshold)
+    # Only compare memory measured the same way; a client's RSS says nothing about the server's
+    baseline_source, current_source = peak_rss_source(baseline), peak_rss_source(current)
+    if baseline_source and baseline_source == current_source:
+        check('peak_rss_kb', baseline['peak_rss_kb'], current['peak_rss_kb'], args.memory_threshold)
+    else:
+        print('Memory not compared: peak RSS missing or measured differently in the two reports')
+
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if regressions:
+        return 1
+    print('No regressions beyond thresholds')
+    return 0
+
+def add_target_arguments(parser):
+    parser.add_argument('--db', default=os.environ.get('EMPLOYEES_DB', 'bench.db'),
+                        help='SQLite file used by the in-process test client')
+    parser.add_argument('--url', help='base URL of a running server; uses real HTTP instead of the test client')
+    parser.add_argument('--server-pid', type=int,
+                        help='pid of the server behind --url, to report its peak memory (Linux only)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the JSON report to this file')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = subparsers.add_parser('seed', help='fill a database with synthetic employees')
+    seed_parser.add_argument('--db', default='bench.db')
+    seed_parser.add_argument('--employees', type=int, default=1000)
+    seed_parser.add_argument('--max-reviews', type=int, default=3, help='reviews per employee are uniform in 0..N')
+    seed_parser.add_argument('--inactive-ratio', type=float, default=0.1)
+    seed_parser.add_argument('--seed', type=int, default=1)
+
+    run_parser = subparsers.add_parser('run', help='drive every endpoint with a mixed read/write workload')
+    add_target_arguments(run_parser)
+    run_parser.add_argument('--requests', type=int, default=5000)
+    run_parser.add_argument('--duration', type=float, help='run for this many seconds instead of a request count')
+    run_parser.add_argument('--write-ratio', type=float, default=0.1)
+
+    replay_parser = subparsers.add_parser('replay', help='replay recorded traffic from a JSON-lines file')
+    add_target_arguments(replay_parser)
+    replay_parser.add_argument('--traffic', required=True,
+                               help='one JSON object per line with method, path and optional json body')
+    replay_parser.add_argument('--repeat', type=int, default=1)
+
+    compare_parser = subparsers.add_parser('compare', help='fail when a run regresses against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--latency-threshold', type=float, default=0.10)
+    compare_parser.add_argument('--memory-threshold', type=float, default=0.20)
+
+    args = parser.parse_args(argv)
+    if args.command == 'seed':
+        seed(args)
+    elif args.command == 'run':
+        write_report(run_workload(args), args.output)
+    elif args.command == 'replay':
+        write_report(run_replay(args), args.output)
+    else:
+        return compare(args)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -53,6 +53,21 @@ document.addEventListener('DOMContentLoaded', function() {
     document.getElementById('show-deactivate-form')?.addEventListener('click', function() {
         toggleVisibility('deactivate');
     });
+
+    document.getElementById('load-more-employees')?.addEventListener('click', function() {
+        loadEmployees(true);
+    });
+
+    // Search re-queries the server, debounced while typing
+    let searchTimer = null;
+    document.getElementById('employee-search')?.addEventListener('input', function() {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => loadEmployees(), 300);
+    });
+
+    document.getElementById('employee-active-only')?.addEventListener('change', function() {
+        loadEmployees();
+    });
 });
 
 function toggleVisibility(formType) {
@@ -70,16 +85,34 @@ function toggleVisibility(formType) {
     });
 }
 
-async function loadEmployees() {
+const EMPLOYEE_PAGE_SIZE = 50;
+const EMPLOYEE_LIST_FIELDS = 'id,name,position,department,contact';
+let nextEmployeeCursor = null;
+
+async function loadEmployees(append = false) {
     try {
-        const response = await fetch('/api/v1/employees');
+        const params = new URLSearchParams({ limit: EMPLOYEE_PAGE_SIZE, fields: EMPLOYEE_LIST_FIELDS });
+        if (append && nextEmployeeCursor !== null) {
+            params.set('after', nextEmployeeCursor);
+        }
+        const search = document.getElementById('employee-search')?.value.trim();
+        if (search && /\w/.test(search)) {
+            params.set('q', search);
+        }
+        if (document.getElementById('employee-active-only')?.checked) {
+            params.set('active', 'true');
+        }
+        const response = await fetch(`/api/v1/employees?${params}`);
         if (!response.ok) {
             throw new Error(`HTTP error! Status: ${response.status}`);
         }
         const data = await response.json();
+        nextEmployeeCursor = data.next_cursor;
         const ul = document.getElementById('employee-list-ul');
         if (ul) {
-            ul.innerHTML = '';
+            if (!append) {
+                ul.innerHTML = '';
+            }
             data.data.forEach(employee => {
                 const li = document.createElement('li');
                 li.className = 'employee-item';
@@ -90,6 +123,10 @@ async function loadEmployees() {
                 ul.appendChild(li);
             });
         }
+        const loadMoreButton = document.getElementById('load-more-employees');
+        if (loadMoreButton) {
+            loadMoreButton.classList.toggle('hidden', nextEmployeeCursor === null);
+        }
     } catch (error) {
         console.error('Error loading employees:', error);
         const ul = document.getElementById('employee-list-ul');